@@ -1,12 +1,13 @@
-from collections import defaultdict
+import argparse
 import os
-import betfairlightweight
 from flumine import FlumineSimulation, clients
 import logging
 from betfairlightweight.filters import streaming_market_data_filter
 
 from src.strategy.strategy import MovingAverageStrategy
 from src.strategy.market_making import MarketMakingStrategy
+from src.utils.conflation import conflate_markets
+from src.utils.ledger import SettlementLedger
 
 # Configure logging
 logging.basicConfig(
@@ -15,77 +16,110 @@ logging.basicConfig(
     format="%(asctime)s - %(message)s",
 )
 
-# Set up the Betfair client
-trading = betfairlightweight.APIClient("", "", "")
-client = clients.SimulatedClient(min_bet_validation=False)
-framework = FlumineSimulation(client=client)
-
 markets_folder = "markets"
-market_files = os.listdir(markets_folder)
-market_ids = ["markets/" + file for file in market_files]
-
-print(f"Processing: {len(market_ids)} markets")
-
-strategy = MovingAverageStrategy(
-    market_filter={"markets": market_ids},
-    market_data_filter=streaming_market_data_filter(
-        fields=["EX_BEST_OFFERS", "EX_LTP", "EX_MARKET_DEF"]
-    ),
-    long_window=100,
-    short_window=35,
-    max_live_trade_count=100000,
-    max_selection_exposure=10000000,
-    # max_liability=1000000,
-    max_order_exposure=10000,
-    price_threshold=0.01
-)
+conflated_markets_folder = "markets_conflated"
 
-strategy = MarketMakingStrategy(
-    max_live_trade_count=100000,
-    max_selection_exposure=10000000,
-    max_order_exposure=10000,
-    market_filter={"markets": market_ids[0:3]},
-    market_data_filter=streaming_market_data_filter(
-        fields=["EX_BEST_OFFERS", "EX_LTP", "EX_MARKET_DEF"]
-    ),
-)
 
-framework.add_strategy(strategy)
-framework.run()
+def get_market_ids(folder=markets_folder):
+    return [os.path.join(folder, file) for file in os.listdir(folder)]
+
+
+def moving_average_strategy(market_ids, long_window=100, short_window=35, **kwargs):
+    return MovingAverageStrategy(
+        market_filter={"markets": market_ids},
+        market_data_filter=streaming_market_data_filter(
+            fields=["EX_BEST_OFFERS", "EX_LTP", "EX_MARKET_DEF"]
+        ),
+        long_window=long_window,
+        short_window=short_window,
+        max_live_trade_count=100000,
+        max_selection_exposure=10000000,
+        # max_liability=1000000,
+        max_order_exposure=10000,
+        price_threshold=0.01,
+        **kwargs
+    )
+
+
+def market_making_strategy(market_ids, **kwargs):
+    return MarketMakingStrategy(
+        max_live_trade_count=100000,
+        max_selection_exposure=10000000,
+        max_order_exposure=10000,
+        market_filter={"markets": market_ids},
+        market_data_filter=streaming_market_data_filter(
+            fields=["EX_BEST_OFFERS", "EX_LTP", "EX_MARKET_DEF"]
+        ),
+        **kwargs
+    )
+
+
+STRATEGIES = {
+    "moving_average": moving_average_strategy,
+    "market_making": market_making_strategy,
+}
+
 
-total_pnl = 0
+def run_simulation(strategy):
+    client = clients.SimulatedClient(min_bet_validation=False)
+    framework = FlumineSimulation(client=client)
+    framework.add_strategy(strategy)
+    framework.run()
+    return framework
+
+
+def run_backtest(strategy_factory, market_ids, blotter_path=None, progress_every=10, verbose=False):
+    """
+    Runs a simulation with PnL and order stats settled incrementally as each
+    market closes, returning the ledger summary.
+    """
+    ledger = SettlementLedger(blotter_path=blotter_path, total_markets=len(market_ids),
+                              progress_every=progress_every, verbose=verbose)
+    try:
+        framework = run_simulation(strategy_factory(market_ids, ledger=ledger))
+        ledger.record_remaining(framework.markets)
+    finally:
+        ledger.close()
+    return ledger.summary()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a historical backtest")
+    parser.add_argument("--strategy", choices=STRATEGIES.keys(),
+                        default="market_making")
+    parser.add_argument("--limit", type=int, default=3,
+                        help="Number of markets to process")
+    conflation = parser.add_mutually_exclusive_group()
+    conflation.add_argument("--conflate-ms", type=int, default=None,
+                            help="Conflate updates onto a fixed time grid")
+    conflation.add_argument("--conflate-ticks", type=int, default=None,
+                            help="Conflate every N updates into one")
+    parser.add_argument("--blotter-path", default="blotter.csv",
+                        help="CSV file settled orders are appended to")
+    parser.add_argument("--progress-every", type=int, default=10,
+                        help="Print a progress line every N settled markets")
+    args = parser.parse_args()
+
+    market_ids = get_market_ids()[0:args.limit]
+
+    if args.conflate_ms is not None or args.conflate_ticks is not None:
+        market_ids, messages_in, messages_out = conflate_markets(
+            market_ids, conflated_markets_folder,
+            interval_ms=args.conflate_ms, ticks=args.conflate_ticks)
+        print(f"Conflated {messages_in} updates into {messages_out}")
+
+    print(f"Processing: {len(market_ids)} markets")
+
+    summary = run_backtest(STRATEGIES[args.strategy], market_ids,
+                           blotter_path=args.blotter_path,
+                           progress_every=args.progress_every, verbose=True)
 
-for market in framework.markets:
-    pnl = sum([o.profit for o in market.blotter])
-    total_pnl += pnl
     print(
-        f"Profit: {pnl:.2f} {market.market_id} {market.market_book.market_definition.market_type}")
-
-    # Create a dictionary to group orders by selection_id
-    orders_by_selection_id = defaultdict(list)
-
-    # Group orders by selection_id
-    for order in market.blotter:
-        if order.size_matched == 0:
-            continue
-        orders_by_selection_id[order.selection_id].append(order)
-
-    # Print the grouped orders
-    for selection_id, orders in orders_by_selection_id.items():
-        for order in orders:
-            print(
-                order.selection_id,
-                order.side,
-                order.responses.date_time_placed,
-                order.date_time_execution_complete,
-                order.status,
-                order.order_type.price,
-                order.average_price_matched,
-                order.size_matched,
-                order.profit,
-                # order.notes['trigger'],
-                # order.notes['side']
-            )
-        print("-" * 40)  # Separator between different selection IDs
-
-print("Total PNL: {0:.2f}".format(total_pnl))
+        f"Settled {summary['markets']} markets | Orders: {summary['orders']} "
+        f"({summary['matched_orders']} matched) | Matched volume: {summary['matched_volume']:.2f} | "
+        f"Max exposure: {summary['max_market_exposure']:.2f}")
+    print("Total PNL: {0:.2f}".format(summary["pnl"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import argparse
+import time
+
+from src.backtest import (STRATEGIES, conflated_markets_folder, get_market_ids,
+                          run_backtest)
+from src.utils.conflation import conflate_markets
+
+
+def _drift(baseline, conflated):
+    diff = conflated - baseline
+    pct = (diff / abs(baseline) * 100) if baseline else 0
+    return diff, pct
+
+
+def compare(strategy_name, market_ids, interval_ms=None, ticks=None):
+    """
+    Runs the strategy over the raw and conflated streams and reports how
+    much conflation reduced the update count and shifted the results.
+    """
+    strategy_factory = STRATEGIES[strategy_name]
+
+    start = time.perf_counter()
+    conflated_ids, messages_in, messages_out = conflate_markets(
+        market_ids, conflated_markets_folder, interval_ms=interval_ms, ticks=ticks)
+    conflation_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    baseline = run_backtest(strategy_factory, market_ids, progress_every=0)
+    baseline_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    conflated = run_backtest(strategy_factory, conflated_ids, progress_every=0)
+    conflated_time = time.perf_counter() - start
+
+    return {
+        "messages_in": messages_in,
+        "messages_out": messages_out,
+        "conflation_time": conflation_time,
+        "baseline_time": baseline_time,
+        "conflated_time": conflated_time,
+        "baseline": baseline,
+        "conflated": conflated,
+    }
+
+
+def print_report(report):
+    messages_in = report["messages_in"]
+    messages_out = report["messages_out"]
+    reduction = (1 - messages_out / messages_in) * 100 if messages_in else 0
+    speedup = report["baseline_time"] / \
+        report["conflated_time"] if report["conflated_time"] else 0
+
+    print(
+        f"Updates: {messages_in} -> {messages_out} ({reduction:.1f}% reduction)")
+    print(
+        f"Runtime: {report['baseline_time']:.2f}s -> {report['conflated_time']:.2f}s "
+        f"({speedup:.2f}x speedup, conflation took {report['conflation_time']:.2f}s)")
+
+    for key in ["pnl", "trades", "matched_orders"]:
+        baseline = report["baseline"][key]
+        conflated = report["conflated"][key]
+        diff, pct = _drift(baseline, conflated)
+        print(
+            f"{key}: {baseline:.2f} -> {conflated:.2f} (drift {diff:+.2f}, {pct:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure the effect of update conflation on a backtest")
+    parser.add_argument("--strategy", choices=STRATEGIES.keys(),
+                        default="moving_average")
+    parser.add_argument("--limit", type=int, default=None,
+                        help="Number of markets to process")
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--conflate-ms", type=int,
+                      help="Conflate updates onto a fixed time grid, e.g. 50, 250, 1000")
+    mode.add_argument("--conflate-ticks", type=int,
+                      help="Conflate every N updates into one")
+    args = parser.parse_args()
+
+    market_ids = get_market_ids()[0:args.limit]
+    print(f"Processing: {len(market_ids)} markets")
+
+    report = compare(args.strategy, market_ids,
+                     interval_ms=args.conflate_ms, ticks=args.conflate_ticks)
+    print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -12,7 +12,7 @@ logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(message)s")
 
 
 class MarketMakingStrategy(BaseStrategy):
-    def __init__(self, *args, min_spread_ticks=2, price_adjustment_ticks=1, **kwargs):
+    def __init__(self, *args, min_spread_ticks=2, price_adjustment_ticks=1, ledger=None, **kwargs):
         super().__init__(*args, **kwargs)
         self.active_trade = None
         self.price_increments = [
@@ -24,6 +24,7 @@ class MarketMakingStrategy(BaseStrategy):
         self.price_adjustment_ticks = price_adjustment_ticks
         self.active_trades = {}
         self.stake_size = 0.1
+        self.ledger = ledger
 
     def check_market_book(self, market, market_book):
         if market.market_type not in ["WIN", "PLACE"]:
@@ -185,6 +186,18 @@ class MarketMakingStrategy(BaseStrategy):
                     logging.warning(
                         f"Executed order {order.id} received but no active trade")
 
+    def process_closed_market(self, market, market_book):
+        self.active_trades = {
+            selection_id: active_trade for selection_id, active_trade in self.active_trades.items()
+            if active_trade["back"].market_id != market.market_id}
+        if self.ledger is not None:
+            self.ledger.record(market)
+
+    def remove_market(self, market_id):
+        super().remove_market(market_id)
+        if self.ledger is not None:
+            self.ledger.release(market_id)
+
     def place_back_order(self, market, market_book, runner, price):
         selection_id = runner.selection_id
         if selection_id in self.active_trades:
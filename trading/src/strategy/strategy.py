@@ -19,7 +19,7 @@ logging.basicConfig(
 
 class MovingAverageStrategy(BaseStrategy):
     def __init__(self, *args, short_window=10, long_window=30, stake_size=2,
-                 stop_loss=0.05, take_profit=0.30, trailing_stop_loss=True, min_volume=1, max_liability=5, price_threshold=0.01, **kwargs):
+                 stop_loss=0.05, take_profit=0.30, trailing_stop_loss=True, min_volume=1, max_liability=5, price_threshold=0.01, ledger=None, **kwargs):
         super().__init__(*args, **kwargs)
         self.short_window = short_window
         self.long_window = long_window
@@ -34,6 +34,7 @@ class MovingAverageStrategy(BaseStrategy):
         self.short_ma = {}
         self.long_ma = {}
         self.trades = {}
+        self.ledger = ledger
 
     def calculate_proportional_stake(self, odds, max_liability):
         if odds <= 1:
@@ -142,3 +143,18 @@ class MovingAverageStrategy(BaseStrategy):
     def process_orders(self, market, orders) -> None:
         for key, value in self.trades.items():
             value.update_orders(orders)
+
+    def process_closed_market(self, market, market_book) -> None:
+        self.trades = {key: value for key, value in self.trades.items()
+                       if value.market_id != market.market_id}
+        for runner in market_book.runners or []:
+            self.prices.pop(runner.selection_id, None)
+            self.short_ma.pop(runner.selection_id, None)
+            self.long_ma.pop(runner.selection_id, None)
+        if self.ledger is not None:
+            self.ledger.record(market)
+
+    def remove_market(self, market_id) -> None:
+        super().remove_market(market_id)
+        if self.ledger is not None:
+            self.ledger.release(market_id)
@@ -0,0 +1,186 @@
+import json
+import os
+
+# Ladders keyed by price: [price, size]
+PRICE_LADDER_KEYS = ("atb", "atl", "trd", "spb", "spl")
+# Ladders keyed by depth level: [level, price, size]
+LEVEL_LADDER_KEYS = ("batb", "batl", "bdatb", "bdatl")
+
+
+def _merge_ladder(existing, updates):
+    ladder = {entry[0]: entry for entry in existing}
+    for entry in updates:
+        ladder[entry[0]] = entry
+    return list(ladder.values())
+
+
+def _merge_runner_change(pending, change):
+    for key, value in change.items():
+        if key in PRICE_LADDER_KEYS or key in LEVEL_LADDER_KEYS:
+            pending[key] = _merge_ladder(pending.get(key, []), value)
+        else:
+            pending[key] = value
+
+
+def _merge_market_change(pending, change):
+    if change.get("img"):
+        # A full image replaces everything seen so far in the bucket
+        pending.clear()
+        pending["rc"] = {}
+
+    for key, value in change.items():
+        if key == "rc":
+            continue
+        if key == "img":
+            pending["img"] = pending.get("img", False) or value
+        else:
+            pending[key] = value
+
+    for runner_change in change.get("rc", []):
+        runner_key = (runner_change["id"], runner_change.get("hc"))
+        if runner_key not in pending["rc"]:
+            pending["rc"][runner_key] = {}
+        _merge_runner_change(pending["rc"][runner_key], runner_change)
+
+
+class StreamConflator:
+    """
+    Merges consecutive market change messages into one message per time
+    bucket (interval_ms) or per fixed number of messages (ticks).
+    Messages carrying a market definition are never merged so status and
+    in-play transitions keep their original publish time.
+    """
+
+    def __init__(self, interval_ms=None, ticks=None):
+        if (interval_ms is None) == (ticks is None):
+            raise ValueError("Specify exactly one of interval_ms or ticks")
+        if (interval_ms if interval_ms is not None else ticks) <= 0:
+            raise ValueError("interval_ms and ticks must be positive")
+        self.interval_ms = interval_ms
+        self.ticks = ticks
+        self._pending = {}
+        self._last_message = None
+        self._bucket = None
+        self._count = 0
+
+    def _bucket_for(self, message):
+        if self.interval_ms is not None:
+            return message["pt"] // self.interval_ms
+        return None
+
+    def flush(self):
+        if self._last_message is None:
+            return None
+
+        mc = []
+        for change in self._pending.values():
+            change = dict(change)
+            change["rc"] = list(change["rc"].values())
+            mc.append(change)
+
+        message = {
+            "op": self._last_message["op"],
+            "clk": self._last_message.get("clk"),
+            "pt": self._last_message["pt"],
+            "mc": mc,
+        }
+        self._pending = {}
+        self._last_message = None
+        self._count = 0
+        return message
+
+    def process(self, message):
+        """Consumes a message and returns the list of messages to emit."""
+        emitted = []
+
+        if message.get("op") != "mcm":
+            flushed = self.flush()
+            if flushed is not None:
+                emitted.append(flushed)
+            emitted.append(message)
+            return emitted
+
+        if any("marketDefinition" in change for change in message.get("mc", [])):
+            flushed = self.flush()
+            if flushed is not None:
+                emitted.append(flushed)
+            emitted.append(message)
+            self._bucket = self._bucket_for(message)
+            return emitted
+
+        bucket = self._bucket_for(message)
+        if self.interval_ms is not None and bucket != self._bucket:
+            flushed = self.flush()
+            if flushed is not None:
+                emitted.append(flushed)
+        self._bucket = bucket
+
+        for change in message.get("mc", []):
+            market_id = change["id"]
+            if market_id not in self._pending:
+                self._pending[market_id] = {"rc": {}}
+            _merge_market_change(self._pending[market_id], change)
+
+        self._last_message = message
+        self._count += 1
+
+        if self.ticks is not None and self._count >= self.ticks:
+            emitted.append(self.flush())
+
+        return emitted
+
+
+def conflation_label(interval_ms=None, ticks=None):
+    return f"{interval_ms}ms" if interval_ms is not None else f"{ticks}ticks"
+
+
+def conflate_file(source_path, target_path, interval_ms=None, ticks=None):
+    """
+    Writes a conflated copy of a stream file and returns the number of
+    messages read and written.
+    """
+    conflator = StreamConflator(interval_ms=interval_ms, ticks=ticks)
+    messages_in = 0
+    messages_out = 0
+
+    with open(source_path, "r") as source, open(target_path, "w") as target:
+        for line in source:
+            line = line.strip()
+            if not line:
+                continue
+            messages_in += 1
+            for message in conflator.process(json.loads(line)):
+                target.write(json.dumps(message, separators=(",", ":")) + "\n")
+                messages_out += 1
+
+        flushed = conflator.flush()
+        if flushed is not None:
+            target.write(json.dumps(flushed, separators=(",", ":")) + "\n")
+            messages_out += 1
+
+    return messages_in, messages_out
+
+
+def conflate_markets(market_paths, output_folder, interval_ms=None, ticks=None):
+    """
+    Conflates every stream file into output_folder/<label>/ and returns the
+    new paths with the total messages read and written.
+    """
+    target_folder = os.path.join(
+        output_folder, conflation_label(interval_ms, ticks))
+    os.makedirs(target_folder, exist_ok=True)
+
+    conflated_paths = []
+    total_in = 0
+    total_out = 0
+
+    for market_path in market_paths:
+        target_path = os.path.join(
+            target_folder, os.path.basename(market_path))
+        messages_in, messages_out = conflate_file(
+            market_path, target_path, interval_ms=interval_ms, ticks=ticks)
+        conflated_paths.append(target_path)
+        total_in += messages_in
+        total_out += messages_out
+
+    return conflated_paths, total_in, total_out
@@ -0,0 +1,64 @@
+import itertools
+import json
+from collections import defaultdict
+from datetime import datetime
+
+
+TRADED_MARKET_TYPES = ["WIN", "PLACE"]
+
+
+def market_definition(market_path):
+    """Reads the first market definition in a stream file."""
+    with open(market_path, "r") as file:
+        for line in file:
+            for change in json.loads(line).get("mc", []):
+                if "marketDefinition" in change:
+                    return change["marketDefinition"]
+    return None
+
+
+def order_races(market_paths):
+    """
+    Groups the markets the strategies trade into races keyed by event and
+    start time, ordered by start time. Each race is (start, [paths]).
+    """
+    races = defaultdict(list)
+    for path in market_paths:
+        definition = market_definition(path)
+        if definition is None or definition["marketType"] not in TRADED_MARKET_TYPES:
+            continue
+        start = datetime.strptime(
+            definition["marketTime"], "%Y-%m-%dT%H:%M:%S.%fZ")
+        races[(start, definition["eventId"])].append(path)
+
+    return [(start, sorted(paths)) for (start, _), paths in sorted(races.items())]
+
+
+def build_folds(ordered_races, train_size, test_size, step=None):
+    """
+    Rolling train/test windows over time ordered races, each test window
+    immediately following its train window. Windows are cut between races so
+    a race's WIN and PLACE markets always land on the same side.
+    """
+    if step is None:
+        step = test_size
+    if train_size < 1 or test_size < 1 or step < 1:
+        raise ValueError("train_size, test_size and step must be at least 1")
+
+    folds = []
+    start = 0
+    while start + train_size + test_size <= len(ordered_races):
+        train = ordered_races[start:start + train_size]
+        test = ordered_races[start + train_size:start + train_size + test_size]
+        folds.append((train, test))
+        start += step
+    return folds
+
+
+def param_combinations(grid):
+    keys = list(grid.keys())
+    combinations = [dict(zip(keys, values))
+                    for values in itertools.product(*grid.values())]
+    # A short window must be shorter than the long window to mean anything
+    return [params for params in combinations
+            if params.get("short_window", 0) < params.get("long_window", 1)]
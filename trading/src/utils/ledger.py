@@ -0,0 +1,184 @@
+import csv
+from collections import defaultdict
+
+from src.utils.utils import market_exposure
+
+
+BLOTTER_COLUMNS = [
+    "market_id", "market_type", "selection_id", "trade_id", "order_id", "side",
+    "date_time_placed", "date_time_execution_complete", "status", "price",
+    "average_price_matched", "size_matched", "profit",
+]
+
+
+def runner_count(market_definition):
+    """
+    Runners that took part, read from runner statuses because a settled
+    definition reports numberOfActiveRunners as 0.
+    """
+    runners = [runner for runner in market_definition.runners or []
+               if runner.status != "REMOVED"]
+    return len(runners) or None
+
+
+class SettlementLedger:
+    """
+    Accumulates PnL, exposure and order stats as each market settles, appends
+    the settled blotter to disk and drops it from memory so a run only holds
+    orders for markets that are still open.
+
+    Blotters are released once flumine has finished clearing the market,
+    either through release() from the strategy's remove_market or when the
+    next market settles, never from inside process_closed_market.
+    """
+
+    def __init__(self, blotter_path=None, total_markets=None, progress_every=10, verbose=False):
+        self.blotter_path = blotter_path
+        self.total_markets = total_markets
+        self.progress_every = progress_every
+        self.verbose = verbose
+        self.settled_market_ids = set()
+        self.pnl = 0
+        self.order_count = 0
+        self.matched_order_count = 0
+        self.trade_count = 0
+        self.matched_volume = 0
+        self.total_exposure = 0
+        self.max_market_exposure = 0
+        self._unreleased_markets = {}
+
+        self._file = None
+        self._writer = None
+        if blotter_path is not None:
+            self._file = open(blotter_path, "w", newline="")
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(BLOTTER_COLUMNS)
+
+    def record(self, market):
+        if market.market_id in self.settled_market_ids:
+            return
+
+        # Flumine clears one market at a time, so anything settled earlier
+        # has finished clearing by now
+        self.release_all()
+
+        self.settled_market_ids.add(market.market_id)
+        self._unreleased_markets[market.market_id] = market
+
+        market_definition = market.market_book.market_definition if market.market_book else None
+        orders = list(market.blotter)
+        pnl = sum([o.profit for o in orders])
+        if market_definition is not None:
+            exposure = market_exposure(orders, number_of_winners=market_definition.number_of_winners or 1,
+                                       number_of_runners=runner_count(market_definition))
+        else:
+            exposure = market_exposure(orders)
+
+        self.pnl += pnl
+        self.order_count += len(orders)
+        self.matched_order_count += len([o for o in orders if o.size_matched > 0])
+        self.trade_count += len({o.trade.id for o in orders})
+        self.matched_volume += sum([o.size_matched for o in orders])
+        self.total_exposure += exposure
+        self.max_market_exposure = max(self.max_market_exposure, exposure)
+
+        market_type = market_definition.market_type if market_definition else None
+
+        if self.verbose:
+            self._print_market(market, market_type, pnl, orders)
+
+        if self._writer is not None:
+            self._write_orders(market, market_type, orders)
+
+        if self.progress_every and len(self.settled_market_ids) % self.progress_every == 0:
+            self.print_progress()
+
+    def record_remaining(self, markets):
+        """Settles any markets the simulation finished without closing."""
+        for market in markets:
+            self.record(market)
+        self.release_all()
+
+    def release(self, market_id):
+        """Drops the settled orders of a market flumine has finished clearing."""
+        market = self._unreleased_markets.pop(market_id, None)
+        if market is not None:
+            # Settled orders are on disk now, swap in an empty blotter of the same kind
+            market.blotter = type(market.blotter)(market.market_id)
+
+    def release_all(self):
+        for market_id in list(self._unreleased_markets):
+            self.release(market_id)
+
+    def _write_orders(self, market, market_type, orders):
+        for order in orders:
+            self._writer.writerow([
+                market.market_id,
+                market_type,
+                order.selection_id,
+                order.trade.id,
+                order.id,
+                order.side,
+                order.responses.date_time_placed,
+                order.date_time_execution_complete,
+                order.status.value if order.status else None,
+                order.order_type.price,
+                order.average_price_matched,
+                order.size_matched,
+                order.profit,
+            ])
+        self._file.flush()
+
+    def _print_market(self, market, market_type, pnl, orders):
+        print(f"Profit: {pnl:.2f} {market.market_id} {market_type}")
+
+        # Create a dictionary to group orders by selection_id
+        orders_by_selection_id = defaultdict(list)
+
+        # Group orders by selection_id
+        for order in orders:
+            if order.size_matched == 0:
+                continue
+            orders_by_selection_id[order.selection_id].append(order)
+
+        # Print the grouped orders
+        for selection_id, selection_orders in orders_by_selection_id.items():
+            for order in selection_orders:
+                print(
+                    order.selection_id,
+                    order.side,
+                    order.responses.date_time_placed,
+                    order.date_time_execution_complete,
+                    order.status,
+                    order.order_type.price,
+                    order.average_price_matched,
+                    order.size_matched,
+                    order.profit,
+                )
+            print("-" * 40)  # Separator between different selection IDs
+
+    def print_progress(self):
+        settled = len(self.settled_market_ids)
+        total = f"/{self.total_markets}" if self.total_markets else ""
+        print(
+            f"Settled {settled}{total} markets | PnL: {self.pnl:.2f} | "
+            f"Orders: {self.order_count} ({self.matched_order_count} matched) | "
+            f"Max exposure: {self.max_market_exposure:.2f}")
+
+    def summary(self):
+        return {
+            "markets": len(self.settled_market_ids),
+            "pnl": self.pnl,
+            "trades": self.trade_count,
+            "orders": self.order_count,
+            "matched_orders": self.matched_order_count,
+            "matched_volume": self.matched_volume,
+            "total_exposure": self.total_exposure,
+            "max_market_exposure": self.max_market_exposure,
+        }
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._writer = None
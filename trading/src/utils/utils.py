@@ -25,3 +25,41 @@ def position_if_lose(order):
         pos += size
 
     return pos
+
+
+def market_exposure(orders, number_of_winners=1, number_of_runners=None):
+    """
+    Worst case loss over every way number_of_winners runners can win, using
+    matched sizes only. Runners without a position count as winners too
+    unless number_of_runners says every runner is held.
+    """
+    pos_if_win = {}
+    pos_if_lose = {}
+
+    for order in orders:
+        if order.size_matched == 0:
+            continue
+        selection_id = order.selection_id
+        price = order.average_price_matched
+        pos_if_win.setdefault(selection_id, 0)
+        pos_if_lose.setdefault(selection_id, 0)
+        if order.side == 'BACK':
+            pos_if_win[selection_id] += order.size_matched * (price - 1)
+            pos_if_lose[selection_id] -= order.size_matched
+        elif order.side == 'LAY':
+            pos_if_win[selection_id] -= order.size_matched * (price - 1)
+            pos_if_lose[selection_id] += order.size_matched
+
+    if not pos_if_win:
+        return 0
+
+    # Each winner moves the result from its lose to its win position, an
+    # unheld winner moves it by nothing
+    deltas = [pos_if_win[selection_id] - pos_if_lose[selection_id]
+              for selection_id in pos_if_win]
+    unheld_runners = number_of_winners if number_of_runners is None else max(
+        number_of_runners - len(deltas), 0)
+    deltas += [0] * min(unheld_runners, number_of_winners)
+
+    worst = sum(pos_if_lose.values()) + sum(sorted(deltas)[:number_of_winners])
+    return max(0, -worst)
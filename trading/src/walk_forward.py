@@ -0,0 +1,133 @@
+import argparse
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
+
+from src.backtest import STRATEGIES, get_market_ids, run_backtest
+from src.utils.folds import build_folds, order_races, param_combinations
+
+
+PARAM_GRIDS = {
+    "moving_average": {
+        "short_window": [10, 20, 35],
+        "long_window": [50, 100],
+    },
+    "market_making": {
+        "min_spread_ticks": [2, 3, 4],
+        "price_adjustment_ticks": [1, 2],
+    },
+}
+
+
+def run_fold(fold_index, strategy_name, train, test, grid):
+    strategy_factory = STRATEGIES[strategy_name]
+    train_ids = [path for _, paths in train for path in paths]
+    test_ids = [path for _, paths in test for path in paths]
+
+    start = time.perf_counter()
+    best_params = None
+    best_train = None
+    for params in param_combinations(grid):
+        summary = run_backtest(partial(strategy_factory, **params),
+                               train_ids, progress_every=0)
+        if best_train is None or summary["pnl"] > best_train["pnl"]:
+            best_params = params
+            best_train = summary
+    train_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    test_summary = run_backtest(partial(strategy_factory, **best_params),
+                                test_ids, progress_every=0)
+    test_time = time.perf_counter() - start
+
+    return {
+        "fold": fold_index,
+        "train_start": train[0][0],
+        "train_end": train[-1][0],
+        "test_start": test[0][0],
+        "test_end": test[-1][0],
+        "params": best_params,
+        "train": best_train,
+        "test": test_summary,
+        "train_time": train_time,
+        "test_time": test_time,
+    }
+
+
+def print_fold(result):
+    print(
+        f"Fold {result['fold']}: train {result['train_start']:%Y-%m-%d %H:%M} - {result['train_end']:%Y-%m-%d %H:%M} "
+        f"test {result['test_start']:%Y-%m-%d %H:%M} - {result['test_end']:%Y-%m-%d %H:%M} | "
+        f"params {result['params']} | train PnL {result['train']['pnl']:.2f} | "
+        f"test PnL {result['test']['pnl']:.2f} | "
+        f"fit {result['train_time']:.2f}s eval {result['test_time']:.2f}s")
+
+
+def print_report(results, wall_time):
+    test_pnls = [result["test"]["pnl"] for result in results]
+    fold_time = sum([result["train_time"] + result["test_time"]
+                    for result in results])
+
+    print("-" * 40)
+    print(f"Folds: {len(results)}")
+    print(f"Out of sample PnL: {sum(test_pnls):.2f}")
+    print(
+        f"Out of sample trades: {sum([result['test']['trades'] for result in results])}")
+    print(f"Mean fold PnL: {statistics.mean(test_pnls):.2f}")
+    if len(test_pnls) > 1:
+        print(f"Fold PnL stdev: {statistics.stdev(test_pnls):.2f}")
+    print(
+        f"Profitable folds: {len([pnl for pnl in test_pnls if pnl > 0])}/{len(test_pnls)}")
+    print(
+        f"Wall time: {wall_time:.2f}s (sum of fold times {fold_time:.2f}s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Walk-forward evaluation over time ordered markets")
+    parser.add_argument("--strategy", choices=STRATEGIES.keys(),
+                        default="moving_average")
+    parser.add_argument("--train-size", type=int, default=12,
+                        help="Races in each train window")
+    parser.add_argument("--test-size", type=int, default=4,
+                        help="Races in each test window")
+    parser.add_argument("--step", type=int, default=None,
+                        help="Races to roll forward between folds, defaults to test size")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Processes to run folds in")
+    args = parser.parse_args()
+
+    for name in ["train_size", "test_size", "step"]:
+        value = getattr(args, name)
+        if value is not None and value < 1:
+            parser.error(f"--{name.replace('_', '-')} must be at least 1")
+
+    ordered_races = order_races(get_market_ids())
+    market_count = sum([len(paths) for _, paths in ordered_races])
+    folds = build_folds(ordered_races, args.train_size,
+                        args.test_size, args.step)
+    print(
+        f"Processing: {market_count} markets in {len(ordered_races)} races, {len(folds)} folds")
+
+    if not folds:
+        return
+
+    grid = PARAM_GRIDS[args.strategy]
+    results = []
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = [executor.submit(run_fold, fold_index, args.strategy, train, test, grid)
+                   for fold_index, (train, test) in enumerate(folds)]
+        for future in as_completed(futures):
+            result = future.result()
+            print_fold(result)
+            results.append(result)
+    wall_time = time.perf_counter() - start
+
+    print_report(sorted(results, key=lambda result: result["fold"]), wall_time)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from src.utils.conflation import (LEVEL_LADDER_KEYS, PRICE_LADDER_KEYS,
+                                  StreamConflator, conflate_file)
+
+
+def _replay(path):
+    """Applies every delta in a stream file and returns the final book with publish times."""
+    book = {}
+    publish_times = []
+
+    with open(path, "r") as file:
+        for line in file:
+            message = json.loads(line)
+            publish_times.append(message["pt"])
+            for change in message.get("mc", []):
+                market = book.setdefault(change["id"], {})
+                if change.get("img"):
+                    market.clear()
+                if "marketDefinition" in change:
+                    market["definition"] = change["marketDefinition"]
+                for runner_change in change.get("rc", []):
+                    runner = market.setdefault(
+                        (runner_change["id"], runner_change.get("hc")), {})
+                    for key, value in runner_change.items():
+                        if key in PRICE_LADDER_KEYS or key in LEVEL_LADDER_KEYS:
+                            ladder = runner.setdefault(key, {})
+                            for entry in value:
+                                if entry[-1] == 0:
+                                    ladder.pop(entry[0], None)
+                                else:
+                                    ladder[entry[0]] = entry
+                        else:
+                            runner[key] = value
+
+    return book, publish_times
+
+
+def _write_stream(path, messages):
+    with open(path, "w") as file:
+        for message in messages:
+            file.write(json.dumps(message) + "\n")
+
+
+def _mcm(pt, rc, **change):
+    return {"op": "mcm", "clk": str(pt), "pt": pt,
+            "mc": [dict({"id": "1.1", "rc": rc}, **change)]}
+
+
+STREAM = [
+    _mcm(1000, [], marketDefinition={"status": "OPEN", "marketType": "WIN"}, img=True),
+    _mcm(1010, [{"id": 1, "atb": [[2.0, 10], [2.1, 5]]}, {"id": 2, "atl": [[3.0, 4]]}]),
+    _mcm(1020, [{"id": 1, "atb": [[2.1, 0], [1.9, 7]]}, {"id": 1, "ltp": 2.0}]),
+    _mcm(1030, [{"id": 2, "batl": [[0, 3.0, 4], [1, 3.1, 2]]}]),
+    _mcm(1240, [{"id": 2, "batl": [[1, 3.2, 1]], "trd": [[3.0, 4]]}]),
+    _mcm(1260, [{"id": 1, "atb": [[2.0, 12]]}, {"id": 3, "spn": 5.5}]),
+    _mcm(1270, [], marketDefinition={"status": "SUSPENDED", "marketType": "WIN"}),
+    _mcm(1280, [{"id": 1, "atb": [[3.0, 1]]}], img=True),
+    _mcm(1290, [{"id": 1, "atb": [[3.0, 0], [3.5, 2]]}]),
+    _mcm(1900, [{"id": 2, "atl": [[3.0, 0]]}]),
+]
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"interval_ms": 50}, {"interval_ms": 250}, {"interval_ms": 1000},
+    {"ticks": 2}, {"ticks": 5},
+])
+def test_conflated_stream_replays_to_same_book(tmp_path, kwargs):
+    source = tmp_path / "source"
+    target = tmp_path / "target"
+    _write_stream(source, STREAM)
+
+    messages_in, messages_out = conflate_file(source, target, **kwargs)
+
+    raw_book, _ = _replay(source)
+    conflated_book, publish_times = _replay(target)
+    assert conflated_book == raw_book
+    assert publish_times == sorted(publish_times)
+    assert messages_in == len(STREAM)
+    assert messages_out < messages_in
+
+
+def test_market_definitions_keep_their_publish_time(tmp_path):
+    source = tmp_path / "source"
+    target = tmp_path / "target"
+    _write_stream(source, STREAM)
+
+    conflate_file(source, target, interval_ms=1000)
+
+    with open(target, "r") as file:
+        messages = [json.loads(line) for line in file]
+    definition_times = [message["pt"] for message in messages
+                        if "marketDefinition" in message["mc"][0]]
+    assert definition_times == [1000, 1270]
+
+
+@pytest.mark.parametrize("kwargs", [
+    {}, {"interval_ms": 250, "ticks": 5}, {"interval_ms": 0}, {"ticks": -1},
+])
+def test_invalid_conflation_settings(kwargs):
+    with pytest.raises(ValueError):
+        StreamConflator(**kwargs)
+
+
+@pytest.mark.parametrize("kwargs", [{"interval_ms": 250}, {"ticks": 5}])
+def test_recorded_market_replays_to_same_book(tmp_path, kwargs):
+    source = Path(__file__).parent.parent / "markets" / "1.229554890"
+    target = tmp_path / "target"
+
+    conflate_file(source, target, **kwargs)
+
+    raw_book, _ = _replay(source)
+    conflated_book, publish_times = _replay(target)
+    assert conflated_book == raw_book
+    assert publish_times == sorted(publish_times)
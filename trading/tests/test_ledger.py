@@ -0,0 +1,179 @@
+import csv
+from enum import Enum
+from types import SimpleNamespace
+
+import pytest
+
+from src.utils.ledger import BLOTTER_COLUMNS, SettlementLedger, runner_count
+
+
+class Status(Enum):
+    EXECUTION_COMPLETE = "Execution complete"
+
+
+class StubBlotter(list):
+    def __init__(self, market_id, orders=()):
+        super().__init__(orders)
+        self.market_id = market_id
+
+
+def _order(order_id, selection_id, side, price, size_matched, profit, trade_id=None):
+    return SimpleNamespace(
+        id=order_id, selection_id=selection_id, side=side,
+        average_price_matched=price if size_matched else None,
+        size_matched=size_matched, profit=profit,
+        trade=SimpleNamespace(id=trade_id or order_id),
+        responses=SimpleNamespace(date_time_placed=None),
+        date_time_execution_complete=None,
+        status=Status.EXECUTION_COMPLETE,
+        order_type=SimpleNamespace(price=price),
+    )
+
+
+def _closed_market(market_id, orders, market_type="WIN", number_of_winners=1,
+                   statuses=("WINNER", "LOSER", "LOSER", "LOSER", "LOSER", "REMOVED")):
+    # Settled definitions report no active runners, only runner statuses
+    market_definition = SimpleNamespace(
+        market_type=market_type, number_of_winners=number_of_winners,
+        number_of_active_runners=0,
+        runners=[SimpleNamespace(status=status) for status in statuses],
+    )
+    return SimpleNamespace(
+        market_id=market_id,
+        market_book=SimpleNamespace(market_definition=market_definition),
+        blotter=StubBlotter(market_id, orders),
+    )
+
+
+def test_runner_count_ignores_removed_runners():
+    market = _closed_market("1.1", [])
+    assert runner_count(market.market_book.market_definition) == 5
+
+
+def test_record_accumulates_stats_from_closed_definition():
+    ledger = SettlementLedger(progress_every=0)
+    market = _closed_market("1.1", [
+        _order("a", 1, "BACK", 5.0, 2.0, -2.0),
+        _order("b", 2, "BACK", 4.0, 0, 0),
+    ])
+
+    ledger.record(market)
+
+    summary = ledger.summary()
+    assert summary["markets"] == 1
+    assert summary["pnl"] == pytest.approx(-2.0)
+    assert summary["orders"] == 2
+    assert summary["matched_orders"] == 1
+    assert summary["trades"] == 2
+    assert summary["matched_volume"] == pytest.approx(2.0)
+    # Another runner winning loses the back stake
+    assert summary["max_market_exposure"] == pytest.approx(2.0)
+
+
+def test_place_market_exposure_from_closed_definition():
+    ledger = SettlementLedger(progress_every=0)
+    market = _closed_market("1.1", [
+        _order("a", 1, "BACK", 3.0, 2.0, -2.0),
+        _order("b", 2, "BACK", 4.0, 3.0, -3.0),
+    ], market_type="PLACE", number_of_winners=2,
+        statuses=["WINNER", "WINNER", "LOSER", "LOSER", "LOSER", "LOSER"])
+
+    ledger.record(market)
+
+    assert ledger.summary()["total_exposure"] == pytest.approx(5.0)
+
+
+def test_duplicate_settlement_is_ignored():
+    ledger = SettlementLedger(progress_every=0)
+    market = _closed_market("1.1", [_order("a", 1, "BACK", 5.0, 2.0, 8.0)])
+
+    ledger.record(market)
+    ledger.record(market)
+
+    assert ledger.summary()["markets"] == 1
+    assert ledger.summary()["pnl"] == pytest.approx(8.0)
+
+
+def test_blotter_is_kept_until_released():
+    ledger = SettlementLedger(progress_every=0)
+    market = _closed_market("1.1", [_order("a", 1, "BACK", 5.0, 2.0, 8.0)])
+
+    ledger.record(market)
+    assert len(market.blotter) == 1
+
+    ledger.release("1.1")
+    assert len(market.blotter) == 0
+    assert isinstance(market.blotter, StubBlotter)
+    assert market.blotter.market_id == "1.1"
+
+    # Releasing twice or an unknown market is a no-op
+    ledger.release("1.1")
+    ledger.release("1.2")
+
+
+def test_next_settlement_releases_earlier_markets():
+    ledger = SettlementLedger(progress_every=0)
+    first = _closed_market("1.1", [_order("a", 1, "BACK", 5.0, 2.0, 8.0)])
+    second = _closed_market("1.2", [_order("b", 1, "LAY", 5.0, 2.0, -8.0)])
+
+    ledger.record(first)
+    ledger.record(second)
+
+    assert len(first.blotter) == 0
+    assert len(second.blotter) == 1
+
+
+def test_record_remaining_settles_and_releases_everything():
+    ledger = SettlementLedger(progress_every=0)
+    first = _closed_market("1.1", [_order("a", 1, "BACK", 5.0, 2.0, 8.0)])
+    second = _closed_market("1.2", [_order("b", 1, "LAY", 5.0, 2.0, -8.0)])
+
+    ledger.record(first)
+    ledger.record_remaining([first, second])
+
+    assert ledger.summary()["markets"] == 2
+    assert ledger.summary()["pnl"] == pytest.approx(0)
+    assert len(first.blotter) == 0
+    assert len(second.blotter) == 0
+
+
+def test_settled_orders_are_written_to_csv(tmp_path):
+    path = tmp_path / "blotter.csv"
+    ledger = SettlementLedger(blotter_path=path, progress_every=0)
+
+    ledger.record(_closed_market("1.1", [
+        _order("a", 1, "BACK", 5.0, 2.0, 8.0, trade_id="t1"),
+        _order("b", 1, "LAY", 4.0, 0, 0, trade_id="t1"),
+    ]))
+    ledger.record(_closed_market(
+        "1.2", [_order("c", 2, "LAY", 3.0, 1.0, -2.0)], market_type="PLACE"))
+    ledger.close()
+
+    with open(path, newline="") as file:
+        rows = list(csv.reader(file))
+
+    assert rows[0] == BLOTTER_COLUMNS
+    assert [(row[0], row[1], row[3], row[4], row[5]) for row in rows[1:]] == [
+        ("1.1", "WIN", "t1", "a", "BACK"),
+        ("1.1", "WIN", "t1", "b", "LAY"),
+        ("1.2", "PLACE", "c", "c", "LAY"),
+    ]
+    assert rows[1][8] == "Execution complete"
+    assert float(rows[1][12]) == pytest.approx(8.0)
+
+
+def test_progress_printed_every_n_markets(capsys):
+    ledger = SettlementLedger(total_markets=5, progress_every=2)
+
+    for index in range(5):
+        ledger.record(_closed_market(f"1.{index}", []))
+
+    lines = capsys.readouterr().out.splitlines()
+    assert [line.split(" | ")[0] for line in lines] == [
+        "Settled 2/5 markets", "Settled 4/5 markets"]
+
+
+def test_close_is_idempotent(tmp_path):
+    ledger = SettlementLedger(blotter_path=tmp_path / "blotter.csv")
+    ledger.close()
+    ledger.close()
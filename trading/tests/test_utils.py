@@ -0,0 +1,46 @@
+from types import SimpleNamespace
+
+import pytest
+
+from src.utils.utils import market_exposure
+
+
+def _order(selection_id, side, price, size):
+    return SimpleNamespace(selection_id=selection_id, side=side,
+                           average_price_matched=price, size_matched=size)
+
+
+def test_no_matched_orders_has_no_exposure():
+    assert market_exposure([_order(1, "BACK", 5.0, 0)]) == 0
+
+
+def test_back_only_loses_stake_when_another_runner_wins():
+    assert market_exposure([_order(1, "BACK", 5.0, 2.0)]) == pytest.approx(2.0)
+
+
+def test_backs_on_some_runners_lose_all_stakes():
+    orders = [_order(1, "BACK", 4.0, 2.0), _order(2, "BACK", 6.0, 3.0)]
+    assert market_exposure(orders, number_of_runners=6) == pytest.approx(5.0)
+
+
+def test_backs_on_every_runner_cannot_all_lose():
+    orders = [_order(1, "BACK", 2.0, 2.0), _order(2, "BACK", 3.0, 1.0)]
+    # Runner 1 wins: +2 - 1, runner 2 wins: +2 - 2
+    assert market_exposure(orders, number_of_runners=2) == 0
+
+
+def test_lay_only_loses_liability_when_selection_wins():
+    assert market_exposure([_order(1, "LAY", 5.0, 2.0)]) == pytest.approx(8.0)
+
+
+def test_mixed_book_takes_worst_outcome():
+    orders = [_order(1, "BACK", 3.0, 2.0), _order(2, "LAY", 4.0, 1.0)]
+    # Runner 1 wins: +4 + 1, runner 2 wins: -2 - 3, other runner wins: -2 + 1
+    assert market_exposure(orders) == pytest.approx(5.0)
+
+
+def test_place_market_uses_number_of_winners():
+    orders = [_order(1, "LAY", 2.0, 2.0), _order(2, "LAY", 3.0, 1.0)]
+    # Both laid runners place: -2 - 2
+    assert market_exposure(orders, number_of_winners=1) == pytest.approx(1.0)
+    assert market_exposure(orders, number_of_winners=2) == pytest.approx(4.0)
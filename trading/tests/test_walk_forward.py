@@ -0,0 +1,108 @@
+import json
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from src.utils.folds import (TRADED_MARKET_TYPES, build_folds, market_definition,
+                             order_races, param_combinations)
+
+
+MARKETS_FOLDER = Path(__file__).parent.parent / "markets"
+
+
+def _write_market(folder, market_id, market_type, market_time, event_id):
+    path = folder / market_id
+    definition = {"marketType": market_type,
+                  "marketTime": market_time, "eventId": event_id}
+    with open(path, "w") as file:
+        file.write(json.dumps({"op": "mcm", "pt": 1, "mc": [
+            {"id": market_id, "marketDefinition": definition, "rc": []}]}) + "\n")
+    return str(path)
+
+
+def _races(count):
+    return [(datetime(2024, 1, 1, index), [f"win{index}", f"place{index}"])
+            for index in range(count)]
+
+
+def test_order_races_groups_by_time_and_event(tmp_path):
+    paths = [
+        _write_market(tmp_path, "1.4", "WIN", "2024-06-02T09:00:00.000Z", "2"),
+        _write_market(tmp_path, "1.1", "WIN", "2024-06-02T08:00:00.000Z", "1"),
+        _write_market(tmp_path, "1.2", "PLACE", "2024-06-02T08:00:00.000Z", "1"),
+        _write_market(tmp_path, "1.3", "WIN", "2024-06-02T08:00:00.000Z", "3"),
+    ]
+
+    races = order_races(paths)
+
+    assert [(start.hour, [Path(path).name for path in race_paths])
+            for start, race_paths in races] == [
+        (8, ["1.1", "1.2"]), (8, ["1.3"]), (9, ["1.4"])]
+
+
+@pytest.mark.parametrize("market_type", ["FORECAST", "EXACTA", "QUINELLA", "MATCH_BET"])
+def test_order_races_drops_untraded_markets(tmp_path, market_type):
+    paths = [
+        _write_market(tmp_path, "1.1", "WIN", "2024-06-02T08:00:00.000Z", "1"),
+        _write_market(tmp_path, "1.2", market_type, "2024-06-02T08:00:00.000Z", "1"),
+    ]
+
+    races = order_races(paths)
+
+    assert [[Path(path).name for path in race_paths]
+            for _, race_paths in races] == [["1.1"]]
+
+
+def test_folds_are_contiguous_and_do_not_overlap():
+    races = _races(20)
+
+    folds = build_folds(races, 6, 3)
+
+    assert len(folds) == 4
+    for index, (train, test) in enumerate(folds):
+        assert train == races[index * 3:index * 3 + 6]
+        assert test == races[index * 3 + 6:index * 3 + 9]
+    tests = [race for _, test in folds for race in test]
+    assert len(tests) == len(set(start for start, _ in tests))
+
+
+@pytest.mark.parametrize("sizes", [(0, 3, None), (6, 0, None), (6, 3, 0), (6, 3, -1)])
+def test_build_folds_rejects_sizes_below_one(sizes):
+    with pytest.raises(ValueError):
+        build_folds(_races(20), *sizes)
+
+
+def test_param_combinations_skip_inverted_windows():
+    combinations = param_combinations(
+        {"short_window": [10, 50], "long_window": [20, 50]})
+    assert combinations == [
+        {"short_window": 10, "long_window": 20},
+        {"short_window": 10, "long_window": 50},
+    ]
+    assert len(param_combinations(
+        {"min_spread_ticks": [2, 3], "price_adjustment_ticks": [1, 2]})) == 4
+
+
+def test_recorded_markets_never_split_a_race():
+    market_paths = [str(path) for path in MARKETS_FOLDER.iterdir()]
+
+    races = order_races(market_paths)
+    folds = build_folds(races, 12, 4)
+
+    assert len(races) == 34
+    assert len(folds) == 5
+    for _, race_paths in races:
+        definitions = [market_definition(path) for path in race_paths]
+        assert {definition["marketType"]
+                for definition in definitions} <= set(TRADED_MARKET_TYPES)
+        assert len({(definition["marketTime"], definition["eventId"])
+                    for definition in definitions}) == 1
+    for train, test in folds:
+        train_races = {(start, tuple(paths)) for start, paths in train}
+        test_races = {(start, tuple(paths)) for start, paths in test}
+        assert not train_races & test_races
+        assert max(start for start, _ in train) < min(start for start, _ in test)
+        train_paths = {path for _, paths in train for path in paths}
+        test_paths = {path for _, paths in test for path in paths}
+        assert not train_paths & test_paths